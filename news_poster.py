@@ -8,21 +8,33 @@ Enhanced version with better rate limiting, trend integration, URL validation, a
 import os
 import random
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
 import tweepy
 import schedule
 import time
+import calendar
 import hashlib
+import re
+import sqlite3
 from datetime import datetime, timedelta
 import pytz
 from openai import OpenAI
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from email.utils import parsedate_to_datetime
+import xml.etree.ElementTree as ET
+import codecs
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import queue
+import atexit
 import traceback
 import sys
-
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 # Load .env variables
@@ -41,17 +53,81 @@ TWITTER_ACCESS_SECRET = os.getenv("TWITTER_ACCESS_SECRET")
 
 # Log files
 LOG_FILE = "bot_log.txt"
+POSTED_DB = "posted.db"
+
+# Legacy text logs, imported into POSTED_DB the first time it is created
 POSTED_LOG = "posted_links.txt"
 CONTENT_HASH_LOG = "posted_content_hashes.txt"
 
-# Image folder
-IMAGE_FOLDER = "images"
-
 # Rate limiting configuration
 DAILY_POST_LIMIT = 7
 POST_INTERVAL_MINUTES = 120
+RATE_LIMIT_DEFAULT_COOLDOWN = timedelta(minutes=15)
+# Seconds to wait before each retry of a failed (non rate-limit) tweet; the next job retries anything longer
+POST_RETRY_DELAYS = (2, 5)
 last_post_time = None
+rate_limit_reset_at = None
 FRESHNESS_WINDOW = timedelta(hours=24)
+FRESHNESS_WINDOW_SECONDS = FRESHNESS_WINDOW.total_seconds()
+
+# OpenAI request limits (the client defaults are a 10 minute timeout with 2 retries)
+OPENAI_TIMEOUT_SECONDS = 20
+OPENAI_MAX_RETRIES = 1
+
+# Concurrent RSS fetching and URL validation
+HTTP_WORKERS = 8
+RSS_ENTRIES_PER_FEED = 5
+VALIDATION_BATCH_SIZE = 5
+
+# Backup categories prefetched alongside the primary one in each job, on their own feed workers
+BACKUP_CATEGORY_COUNT = 2
+BACKUP_FEED_WORKERS = 4
+
+# Feed results are reused for this many seconds (errors and empty feeds are not cached)
+FEED_CACHE_TTL = 300
+FEED_CACHE = {}  # feed url -> (fetched_at, articles, etag, last_modified)
+
+# HTTP connection pooling (host pools kept alive / connections kept per host)
+HTTP_POOL_CONNECTIONS = 32
+HTTP_POOL_MAXSIZE = 16
+
+# Transient connection/read failures are retried by the adapter with a short backoff
+# (error statuses are not retried and Retry-After is ignored, so a server cannot stall a worker)
+HTTP_MAX_RETRIES = 2
+HTTP_RETRY_BACKOFF = 0.3
+
+# (connect, read) timeouts in seconds: fail fast on unreachable hosts, allow slower bodies
+URL_CHECK_TIMEOUT = (3, 5)
+FETCH_TIMEOUT = (3, 10)
+
+# Trends are cached per WOEID for this many seconds (Twitter refreshes them about every 5 minutes)
+TRENDS_CACHE_TTL = 300
+TRENDS_CACHE = {}
+
+# A trend-matched (category, trend_term) is reused by jobs starting within this many seconds
+TREND_CATEGORY_CACHE_TTL = 900
+trend_category_cache = None
+
+# URL validation results are reused: successes for 6 hours, failures for 10 minutes
+VALIDATION_SUCCESS_TTL = 6 * 60 * 60
+VALIDATION_FAILURE_TTL = 10 * 60
+VALIDATION_CACHE_MAX_ENTRIES = 1024
+VALIDATION_CACHE = OrderedDict()
+# Validations run concurrently on http_executor, so every cache access holds this lock
+validation_cache_lock = threading.Lock()
+
+# Article extraction stops downloading after this many bytes
+ARTICLE_MAX_BYTES = 512 * 1024
+
+# In-process LRU caches for extracted article text and generated posts
+CACHE_MAX_ENTRIES = 512
+ARTICLE_CONTENT_CACHE = OrderedDict()
+GENERATED_POST_CACHE = OrderedDict()
+
+# Near-duplicate detection (64-bit SimHash over title trigrams, banded for lookup)
+SIMHASH_MAX_DISTANCE = 4
+SIMHASH_BANDS = 8
+SIMILARITY_WINDOW = timedelta(days=30)
 
 
 # RSS feeds mapped to categories
@@ -138,6 +214,25 @@ RSS_FEEDS = {
     ]
 }
 
+# Category names, fixed at import for random selection
+CATEGORY_LIST = tuple(RSS_FEEDS)
+
+# Trend locations per category (1 = worldwide, 23424863 = Kenya)
+CATEGORY_WOEIDS = {
+    "Kenyan Politics": 23424863,
+    "Kenyan Tourism": 23424863,
+    "Arsenal": 1,
+    "Manchester United": 1,
+    "EPL": 1,
+    "F1": 1,
+    "MotoGP": 1,
+    "World Finance": 1,
+    "Crypto": 1,
+    "Cycling": 1,
+    "Space Exploration": 1,
+    "Tesla": 1
+}
+
 # Hashtag pools
 CATEGORY_HASHTAGS = {
     "Arsenal": ["#Arsenal", "#COYG", "#PremierLeague", "#Saka", "#Odegaard", "#Saliba", "#Arteta", "#Gunners", "#AFC"],
@@ -153,6 +248,22 @@ CATEGORY_HASHTAGS = {
     "Space Exploration": ["#Space", "#NASA", "#SpaceX", "#Mars", "#MoonMission", "#Astronomy", "#Starlink", "#SpaceExploration"],
     "Tesla": ["#Tesla", "#ElonMusk", "#ElectricCars", "#ModelY", "#Cybertruck", "#TeslaNews", "#EV", "#SustainableTransport"]
 }
+CATEGORY_HASHTAGS = {cat: tuple(tags) for cat, tags in CATEGORY_HASHTAGS.items()}
+
+# Lowercase keywords for the first three hashtags of each category, checked against post text
+CATEGORY_TAG_KEYWORDS = {
+    cat: [(tag, tag.replace("#", "").lower()) for tag in tags[:3]]
+    for cat, tags in CATEGORY_HASHTAGS.items()
+}
+
+# One-pass matchers for those keywords: a lookahead alternation finds matches at every position,
+# longest keyword first, so a keyword hidden inside a longer hit is still a substring of that hit
+CATEGORY_TAG_PATTERNS = {
+    cat: re.compile("(?=(%s))" % "|".join(
+        re.escape(keyword) for keyword in sorted((kw for _, kw in tag_keywords), key=len, reverse=True)
+    ))
+    for cat, tag_keywords in CATEGORY_TAG_KEYWORDS.items()
+}
 
 # Mapping trends to categories
 TREND_KEYWORDS = {
@@ -170,6 +281,12 @@ TREND_KEYWORDS = {
     "Tesla": ["Tesla", "Elon Musk", "Cybertruck", "Model Y", "Electric Vehicles", "EV", "Autonomous Driving"]
 }
 
+# Precompiled trend matchers: one lowercase keyword alternation per category, in TREND_KEYWORDS order
+TREND_PATTERNS = [
+    (cat, re.compile("|".join(re.escape(kw.lower()) for kw in keywords)))
+    for cat, keywords in TREND_KEYWORDS.items()
+]
+
 # Freshness + fallback
 FALLBACK_KEYWORDS = {
     "Arsenal": ["Arsenal FC", "Gunners", "Premier League"],
@@ -186,6 +303,9 @@ FALLBACK_KEYWORDS = {
     "Tesla": ["Tesla", "Electric Vehicles", "Elon Musk"]
 }
 
+# Lowercase fallback keywords for filtering article titles
+FALLBACK_KEYWORDS_LC = {cat: [kw.lower() for kw in keywords] for cat, keywords in FALLBACK_KEYWORDS.items()}
+
 EVERGREEN_HOOKS = {
     "Arsenal": [
         "Arsenal fans know hope is the deadliest weapon. #COYG",
@@ -248,26 +368,30 @@ EVERGREEN_HOOKS = {
         "Elon’s vision keeps Tesla charging ahead."
     ]
 }
-
-# Image categories for better matching
-IMAGE_CATEGORIES = {
-    "Arsenal": ["arsenal", "football", "soccer", "gunners"],
-    "Manchester United": ["manchester united", "manutd", "football", "red devils"],
-    "EPL": ["football", "soccer", "premier", "epl"],
-    "F1": ["f1", "racing", "formula", "motorsport"],
-    "MotoGP": ["motogp", "motorcycle", "racing", "grand prix"],
-    "Kenyan Politics": ["kenya", "politics", "nairobi", "africa"],
-    "Kenyan Tourism": ["kenya", "safari", "tourism", "maasai mara"],
-    "World Finance": ["finance", "money", "business", "stocks"],
-    "Crypto": ["crypto", "bitcoin", "blockchain", "ethereum"],
-    "Cycling": ["cycling", "bike", "tour", "bicycle"],
-    "Space Exploration": ["space", "nasa", "spacex", "astronomy"],
-    "Tesla": ["tesla", "electric car", "cybertruck", "elon musk"]
+EVERGREEN_HOOKS = {cat: tuple(hooks) for cat, hooks in EVERGREEN_HOOKS.items()}
+
+# Fallback post prefixes
+FALLBACK_PREFIXES = {
+    "Arsenal": ("Arsenal news:", "Gunners update:", "Arsenal:"),
+    "Manchester United": ("Man Utd news:", "Red Devils update:", "MUFC:"),
+    "EPL": ("Premier League:", "EPL update:"),
+    "F1": ("F1 news:", "Formula 1:"),
+    "MotoGP": ("MotoGP news:", "Grand Prix update:"),
+    "Kenyan Politics": ("Kenya:", "Politics news:"),
+    "Kenyan Tourism": ("Kenya travel:", "Safari update:"),
+    "World Finance": ("Markets:", "Finance:"),
+    "Crypto": ("Crypto news:", "Blockchain update:"),
+    "Cycling": ("Cycling news:", "Pro cycling:"),
+    "Space Exploration": ("Space news:", "NASA update:"),
+    "Tesla": ("Tesla news:", "EV update:")
 }
+DEFAULT_FALLBACK_PREFIXES = ("News:",)
 
+# Random source for post text choices, kept apart from the global random module's shared state
+rng = random.Random()
 
-# GPT Client
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
+# GPT Client (bounded timeout so a slow completion cannot stall a posting job)
+openai_client = OpenAI(api_key=OPENAI_API_KEY, timeout=OPENAI_TIMEOUT_SECONDS, max_retries=OPENAI_MAX_RETRIES)
 
 # Twitter Client
 auth = tweepy.OAuth1UserHandler(
@@ -282,18 +406,54 @@ twitter_client = tweepy.Client(
     access_token_secret=TWITTER_ACCESS_SECRET
 )
 
+# HTTP Session (shared so feed, validation and article requests reuse connections)
+http_session = requests.Session()
+http_session.headers.update({
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Referer': 'https://www.google.com/'
+})
+http_adapter = HTTPAdapter(
+    pool_connections=HTTP_POOL_CONNECTIONS,
+    pool_maxsize=HTTP_POOL_MAXSIZE,
+    max_retries=Retry(
+        total=HTTP_MAX_RETRIES,
+        status=0,
+        backoff_factor=HTTP_RETRY_BACKOFF,
+        respect_retry_after_header=False
+    )
+)
+http_session.mount("http://", http_adapter)
+http_session.mount("https://", http_adapter)
+
+# Feed fetch / URL validation workers, shared by every caller so threads are reused and concurrency stays bounded
+http_executor = ThreadPoolExecutor(max_workers=HTTP_WORKERS)
+
+# Backup category prefetch runs on its own pools so it never queues ahead of the primary category's work
+category_executor = ThreadPoolExecutor(max_workers=BACKUP_CATEGORY_COUNT)
+backup_feed_executor = ThreadPoolExecutor(max_workers=BACKUP_FEED_WORKERS)
+
 # =========================
 # LOGGING
 # =========================
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] %(levelname)s: %(message)s",
-    handlers=[
-        RotatingFileHandler(LOG_FILE, maxBytes=10*1024*1024, backupCount=5),
-        logging.StreamHandler()
-    ]
-)
+# Callers only enqueue records; a background listener thread does the file/console I/O
+log_formatter = logging.Formatter("[%(asctime)s] %(levelname)s: %(message)s")
+log_handlers = [
+    RotatingFileHandler(LOG_FILE, maxBytes=10*1024*1024, backupCount=5),
+    logging.StreamHandler()
+]
+for handler in log_handlers:
+    handler.setFormatter(log_formatter)
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+queue_handler = QueueHandler(log_queue)
+# Leave the record's message untouched; the listener's handlers apply log_formatter
+queue_handler.setFormatter(logging.Formatter("%(message)s"))
+logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
 
 def write_log(message, level="info"):
     """Append timestamped logs to bot_log.txt"""
@@ -326,16 +486,26 @@ def test_twitter_connection():
         write_log(f"Twitter API connection failed: {e}", level="error")
         return False
 
-def validate_url(url, timeout=8):
+def validate_url(url, timeout=URL_CHECK_TIMEOUT):
+    """Validate a URL, reusing recent results (successes for longer than failures)."""
+    with validation_cache_lock:
+        cached = VALIDATION_CACHE.get(url)
+    if cached and time.time() < cached[1]:
+        return cached[0]
+    is_valid = check_url(url, timeout)
+    ttl = VALIDATION_SUCCESS_TTL if is_valid else VALIDATION_FAILURE_TTL
+    with validation_cache_lock:
+        VALIDATION_CACHE[url] = (is_valid, time.time() + ttl)
+        VALIDATION_CACHE.move_to_end(url)
+        # Evict the oldest results once the cap is exceeded, expired or not
+        while len(VALIDATION_CACHE) > VALIDATION_CACHE_MAX_ENTRIES:
+            VALIDATION_CACHE.popitem(last=False)
+    return is_valid
+
+def check_url(url, timeout=URL_CHECK_TIMEOUT):
     """Validate that a URL is accessible and returns valid content."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Referer': 'https://www.google.com/'
-        }
-        response = requests.head(url, headers=headers, timeout=timeout, allow_redirects=True)
+        response = http_session.head(url, timeout=timeout, allow_redirects=True)
         if response.status_code == 200:
             return True
         elif response.status_code in [301, 302, 307, 308]:
@@ -343,7 +513,7 @@ def validate_url(url, timeout=8):
             return True
         elif response.status_code == 405:
             try:
-                response = requests.get(url, headers=headers, timeout=timeout)
+                response = http_session.get(url, timeout=timeout)
                 return response.status_code == 200
             except:
                 return False
@@ -366,36 +536,125 @@ def validate_url(url, timeout=8):
         write_log(f"URL validation failed - Unknown error: {url} ({e})")
         return False
 
+def load_log_entries(path):
+    """Load a one-entry-per-line log file into a set."""
+    if not os.path.exists(path):
+        return set()
+    with open(path, "r") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def migrate_text_logs(db):
+    """Import entries from the legacy text logs into an empty posts table."""
+    migrated_at = time.time()
+    rows = [(url, None, None, migrated_at) for url in load_log_entries(POSTED_LOG)]
+    rows += [(None, content_hash, None, migrated_at) for content_hash in load_log_entries(CONTENT_HASH_LOG)]
+    if not rows:
+        return
+    db.execute("BEGIN")
+    db.executemany("INSERT OR IGNORE INTO posts (url, content_hash, simhash, posted_at) VALUES (?, ?, ?, ?)", rows)
+    db.execute("COMMIT")
+    write_log(f"Migrated {len(rows)} entries from text logs into {POSTED_DB}")
+
+def open_posted_db(path):
+    """Open the posted-items database, creating the schema on first use."""
+    db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("""CREATE TABLE IF NOT EXISTS posts (
+        id INTEGER PRIMARY KEY,
+        url TEXT UNIQUE,
+        content_hash TEXT,
+        simhash TEXT,
+        posted_at REAL
+    )""")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_posts_content_hash ON posts (content_hash)")
+    db.execute("CREATE INDEX IF NOT EXISTS idx_posts_posted_at ON posts (posted_at)")
+    if db.execute("SELECT 1 FROM posts LIMIT 1").fetchone() is None:
+        migrate_text_logs(db)
+    return db
+
+posted_db = open_posted_db(POSTED_DB)
+
+# Posted URLs and content hashes, loaded once from the database and kept in sync on insert
+POSTED_URLS = {url for (url,) in posted_db.execute("SELECT url FROM posts WHERE url IS NOT NULL")}
+POSTED_HASHES = {h for (h,) in posted_db.execute("SELECT content_hash FROM posts WHERE content_hash IS NOT NULL")}
+
 def has_been_posted(url):
     """Check if a URL has already been posted."""
-    if not os.path.exists(POSTED_LOG):
-        return False
-    with open(POSTED_LOG, "r") as f:
-        return url.strip() in f.read()
-
-def get_content_hash(title):
-    """Generate hash for content similarity checking."""
-    normalized = title.lower().strip()
-    return hashlib.md5(normalized.encode()).hexdigest()
-
-def has_similar_content_posted(title):
-    """Check if similar content has been posted recently."""
-    if not os.path.exists(CONTENT_HASH_LOG):
-        return False
-    content_hash = get_content_hash(title)
-    with open(CONTENT_HASH_LOG, "r") as f:
-        return content_hash in f.read()
-
-def log_content_hash(title):
-    """Record content hash to prevent similar posts."""
-    content_hash = get_content_hash(title)
-    with open(CONTENT_HASH_LOG, "a") as f:
-        f.write(f"{content_hash}\n")
+    return url.strip() in POSTED_URLS
+
+def normalize_title(title):
+    """Lowercase and trim a title; articles carry the result as "title_lower"."""
+    return title.lower().strip()
+
+def get_content_hash(title_lower):
+    """Generate hash of a normalized title for content similarity checking."""
+    return hashlib.blake2b(title_lower.encode(), digest_size=16).hexdigest()
+
+def get_title_simhash(title_lower):
+    """Generate a 64-bit SimHash of a normalized title's character trigrams."""
+    normalized = " ".join(re.findall(r"\w+", title_lower))
+    shingles = {normalized[i:i + 3] for i in range(max(1, len(normalized) - 2))}
+    weights = [0] * 64
+    for shingle in shingles:
+        value = int.from_bytes(hashlib.blake2b(shingle.encode(), digest_size=8).digest(), "big")
+        for bit in range(64):
+            weights[bit] += 1 if value >> bit & 1 else -1
+    return sum(1 << bit for bit in range(64) if weights[bit] > 0)
+
+def get_simhash_bands(simhash):
+    """Split a SimHash into (band, value) keys for the lookup index."""
+    band_bits = 64 // SIMHASH_BANDS
+    mask = (1 << band_bits) - 1
+    return [(band, simhash >> (band * band_bits) & mask) for band in range(SIMHASH_BANDS)]
+
+def add_to_simhash_index(index, simhash, posted_at):
+    """Register a SimHash and its post time under each of its bands."""
+    for key in get_simhash_bands(simhash):
+        index.setdefault(key, []).append((simhash, posted_at))
+
+def load_simhash_index(db):
+    """Build the band index from the SimHashes of posts within SIMILARITY_WINDOW."""
+    index = {}
+    cutoff = time.time() - SIMILARITY_WINDOW.total_seconds()
+    rows = db.execute("SELECT simhash, posted_at FROM posts WHERE simhash IS NOT NULL AND posted_at >= ?", (cutoff,))
+    for entry, posted_at in rows:
+        add_to_simhash_index(index, int(entry, 16), posted_at)
+    return index
+
+# Any two SimHashes within SIMHASH_MAX_DISTANCE bits share at least one band
+SIMHASH_INDEX = load_simhash_index(posted_db)
+
+def get_article_simhash(article):
+    """Return the article's title SimHash, computing it on first use."""
+    if "simhash" not in article:
+        article["simhash"] = get_title_simhash(article["title_lower"])
+    return article["simhash"]
+
+def has_similar_content_posted(article):
+    """Check if the same or a near-duplicate title has been posted."""
+    # Exact title hash is a set lookup; only fall through to SimHash work when it misses
+    if article["content_hash"] in POSTED_HASHES:
+        return True
+    simhash = get_article_simhash(article)
+    # The process runs for weeks, so posts that aged out of the window since startup are skipped here
+    cutoff = time.time() - SIMILARITY_WINDOW.total_seconds()
+    for key in get_simhash_bands(simhash):
+        for candidate, posted_at in SIMHASH_INDEX.get(key, []):
+            if posted_at >= cutoff and bin(simhash ^ candidate).count("1") <= SIMHASH_MAX_DISTANCE:
+                return True
+    return False
 
-def log_posted(url):
-    """Record posted URL."""
-    with open(POSTED_LOG, "a") as f:
-        f.write(url.strip() + "\n")
+def log_posted(url, content_hash, simhash):
+    """Record a posted article's URL and title hashes."""
+    url = url.strip()
+    posted_at = time.time()
+    posted_db.execute(
+        "INSERT OR IGNORE INTO posts (url, content_hash, simhash, posted_at) VALUES (?, ?, ?, ?)",
+        (url, content_hash, f"{simhash:016x}", posted_at)
+    )
+    POSTED_URLS.add(url)
+    POSTED_HASHES.add(content_hash)
+    add_to_simhash_index(SIMHASH_INDEX, simhash, posted_at)
 
 def shorten_url(url):
     """Optional: Integrate Bitly or TinyURL for shortening."""
@@ -407,105 +666,283 @@ def validate_tweet_length(text):
         return text[:277] + "..."
     return text
 
+def cache_get(cache, key):
+    """Return a cached value (or None) and mark it as recently used."""
+    if key not in cache:
+        return None
+    cache.move_to_end(key)
+    return cache[key]
+
+def cache_put(cache, key, value):
+    """Store a value, evicting the least recently used entries beyond CACHE_MAX_ENTRIES."""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > CACHE_MAX_ENTRIES:
+        cache.popitem(last=False)
+
+class TokenBucket:
+    """Thread-safe token bucket holding up to `capacity` tokens, refilled evenly over `period` seconds."""
+
+    def __init__(self, capacity, period):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.capacity / self.period)
+        self.updated_at = now
+
+    def take(self):
+        """Take a token and return 0, or return the seconds until one is available."""
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) * self.period / self.capacity
+
+    def give_back(self):
+        """Return a token taken for an attempt that did not go through."""
+        with self.lock:
+            self.tokens = min(self.capacity, self.tokens + 1)
+
+# Daily post budget shared by every posting path
+post_bucket = TokenBucket(DAILY_POST_LIMIT, 24 * 60 * 60)
+
 def can_post_now():
-    """Check if enough time has passed since last post."""
-    global last_post_time
+    """Check if enough time has passed since last post and no rate-limit cooldown is active."""
+    now = datetime.now(pytz.UTC)
+    if rate_limit_reset_at is not None and now < rate_limit_reset_at:
+        return False
     if last_post_time is None:
         return True
-    time_since_last = datetime.now(pytz.UTC) - last_post_time
+    time_since_last = now - last_post_time
     return time_since_last.total_seconds() >= (POST_INTERVAL_MINUTES * 60)
 
+def get_rate_limit_reset(error):
+    """Read Twitter's x-rate-limit-reset header from a 429 error, defaulting to a fixed cooldown."""
+    response = getattr(error, "response", None)
+    reset = response.headers.get("x-rate-limit-reset") if response is not None else None
+    if reset and str(reset).isdigit():
+        return datetime.fromtimestamp(int(reset), pytz.UTC)
+    return datetime.now(pytz.UTC) + RATE_LIMIT_DEFAULT_COOLDOWN
+
 
 # =========================
 # NEWS FETCHING
 # =========================
 
-def fetch_rss(feed_url):
-    """Fetch news from an RSS feed with better error handling."""
+def parse_rss_date(value):
+    """Parse an RFC 822 (or ISO 8601) pubDate into a UTC struct_time like feedparser's published_parsed."""
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(feed_url, headers=headers, timeout=10)
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
-        if feed.bozo:
-            write_log(f"Feed parsing issues for {feed_url} - continuing anyway")
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        try:
+            dt = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+        except (AttributeError, ValueError):
+            return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(pytz.UTC)
+    return dt.timetuple()
+
+def get_published_ts(published_parsed):
+    """Convert a UTC struct_time into a Unix timestamp, or None if missing or invalid."""
+    if not published_parsed:
+        return None
+    try:
+        return calendar.timegm(published_parsed)
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+def read_rss_entries(chunks, limit):
+    """Incrementally parse an RSS 2.0 stream, stopping after `limit` items.
+
+    Returns (entries, consumed): entries is a list of (title, link, published_parsed)
+    tuples, or None if the document is not plain RSS 2.0 XML or has a pubDate this
+    parser cannot read, in which case consumed holds the bytes read so far for a
+    full feedparser pass.
+    """
+    parser = ET.XMLPullParser(events=("start", "end"))
+    consumed = []
+    entries = []
+    root_seen = False
+    for chunk in chunks:
+        consumed.append(chunk)
+        try:
+            parser.feed(chunk)
+            events = list(parser.read_events())
+        except Exception:
+            # Malformed XML, undeclared HTML entities, unsupported encodings, ...
+            return None, consumed
+        for event, elem in events:
+            if event == "start":
+                if not root_seen:
+                    root_seen = True
+                    if elem.tag != "rss":
+                        return None, consumed
+            elif elem.tag == "item":
+                title = (elem.findtext("title") or "").strip()
+                link = (elem.findtext("link") or "").strip()
+                guid = elem.find("guid")
+                # Like feedparser, a permalink guid stands in for a missing <link>
+                if not link and guid is not None and guid.get("isPermaLink", "true") == "true":
+                    link = (guid.text or "").strip()
+                pub_date = elem.findtext("pubDate")
+                published_parsed = parse_rss_date(pub_date) if pub_date else None
+                if pub_date and published_parsed is None:
+                    # Unusual date format: feedparser's date handling beats treating the item as undated (always fresh)
+                    return None, consumed
+                if title and link:
+                    entries.append((title, link, published_parsed))
+                elem.clear()
+                if len(entries) >= limit:
+                    return entries, consumed
+    return (entries if entries else None), consumed
+
+def download_rss(feed_url, etag=None, last_modified=None):
+    """Fetch news from an RSS feed with better error handling.
+
+    Returns (articles, etag, last_modified); articles is None when the server
+    answers a conditional request with 304 Not Modified.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    try:
+        with http_session.get(feed_url, headers=headers, timeout=FETCH_TIMEOUT, stream=True) as response:
+            if response.status_code == 304:
+                return None, etag, last_modified
+            response.raise_for_status()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            chunks = response.iter_content(chunk_size=16384)
+            entries, consumed = read_rss_entries(chunks, RSS_ENTRIES_PER_FEED)
+            if entries is None:
+                body = b"".join(consumed) + b"".join(chunks)
+        if entries is None:
+            # Atom/RDF or irregular feeds: let feedparser handle the whole document
+            # Only titles and links are used, so skip sanitizing/rewriting the entries' HTML bodies
+            feed = feedparser.parse(body, sanitize_html=False, resolve_relative_uris=False)
+            if feed.bozo:
+                write_log(f"Feed parsing issues for {feed_url} - continuing anyway")
+            entries = [
+                (entry.title, entry.link, getattr(entry, 'published_parsed', None))
+                for entry in feed.entries[:RSS_ENTRIES_PER_FEED]
+            ]
         articles = []
-        for entry in feed.entries[:5]:
+        for title, link, published_parsed in entries:
+            title_lower = normalize_title(title)
             article = {
-                "title": entry.title,
-                "url": entry.link,
-                "published_parsed": getattr(entry, 'published_parsed', None)
+                "title": title,
+                "title_lower": title_lower,
+                "url": link,
+                "published_parsed": published_parsed,
+                "published_ts": get_published_ts(published_parsed),
+                "content_hash": get_content_hash(title_lower)
             }
             articles.append(article)
-        return articles
+        return articles, etag, last_modified
     except Exception as e:
         write_log(f"Error fetching RSS from {feed_url}: {e}")
-        return []
+        return [], None, None
 
-def is_fresh(article):
-    """Check if article is within freshness window."""
-    pub_date = article.get('published_parsed')
-    if not pub_date:
-        return True
-    try:
-        dt = datetime(*pub_date[:6], tzinfo=pytz.UTC)
-        return datetime.now(pytz.UTC) - dt <= FRESHNESS_WINDOW
-    except:
-        return True
-        
-def get_articles_for_category(category):
-    """Get articles for a category by looping through all RSS feeds."""
-    feeds = RSS_FEEDS.get(category, [])
-    articles = []
-    for feed in feeds:
-        write_log(f"Processing RSS feed for {category}: {feed}")
-        feed_articles = fetch_rss(feed)
-        articles.extend(feed_articles)
-    if not articles:
-        write_log(f"No articles found for {category} after checking all feeds")
-        if category in FALLBACK_KEYWORDS:
-            write_log(f"Trying fallback keywords for {category}...")
-            for alt in FALLBACK_KEYWORDS[category]:
-                for feed in feeds:
-                    feed_articles = fetch_rss(feed)
-                    articles.extend(feed_articles)
-                    if feed_articles:
-                        write_log(f"Found {len(feed_articles)} articles with fallback keyword '{alt}' from {feed}")
-    write_log(f"Total articles fetched for {category}: {len(articles)}")
+def fetch_rss(feed_url):
+    """Fetch a feed's articles, reusing a successful result younger than FEED_CACHE_TTL.
+
+    Older results are revalidated with a conditional GET and kept if the feed is unchanged.
+    """
+    cached = FEED_CACHE.get(feed_url)
+    if cached and time.time() - cached[0] < FEED_CACHE_TTL:
+        return cached[1]
+    etag, last_modified = cached[2:] if cached else (None, None)
+    articles, etag, last_modified = download_rss(feed_url, etag, last_modified)
+    if articles is None:
+        # 304 without a cached copy (misbehaving proxy, or the entry was replaced meanwhile): nothing to reuse
+        articles = cached[1] if cached else []
+    if articles:
+        FEED_CACHE[feed_url] = (time.time(), articles, etag, last_modified)
     return articles
 
+def fetch_feeds(feeds, executor=http_executor):
+    """Fetch several RSS feeds concurrently, returning one article list per feed in input order."""
+    return list(executor.map(fetch_rss, feeds))
+
+def is_fresh(article, now_ts=None):
+    """Check if article is within freshness window (articles without a date count as fresh)."""
+    published_ts = article.get("published_ts")
+    if published_ts is None:
+        return True
+    if now_ts is None:
+        now_ts = time.time()
+    return now_ts - published_ts <= FRESHNESS_WINDOW_SECONDS
 
 # =========================
 # CONTENT-AWARE POST GENERATION
 # =========================
 
+class ArticleSummaryParser(HTMLParser):
+    """Incremental HTML parser that picks out the meta description or first substantial paragraph."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.description = None
+        self.paragraph = None
+        self._paragraph_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "meta" and self.description is None:
+            attrs = dict(attrs)
+            if attrs.get("name") == "description" and attrs.get("content"):
+                self.description = attrs["content"]
+        elif tag == "p":
+            # A new <p> implicitly closes an unterminated one
+            self._close_paragraph()
+            self._paragraph_parts = []
+
+    def handle_endtag(self, tag):
+        if tag == "p":
+            self._close_paragraph()
+
+    def handle_data(self, data):
+        if self._paragraph_parts is not None:
+            self._paragraph_parts.append(data)
+
+    def _close_paragraph(self):
+        if self._paragraph_parts is None:
+            return
+        text = "".join(self._paragraph_parts).strip()
+        self._paragraph_parts = None
+        if len(text) > 50 and self.paragraph is None:
+            self.paragraph = text
+
 def extract_article_content(url):
-    """Fetch and extract main content from article URL using BeautifulSoup only."""
+    """Stream an article page and extract its meta description or first substantial paragraph."""
+    cached = cache_get(ARTICLE_CONTENT_CACHE, url)
+    if cached is not None:
+        return cached
     try:
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/117.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Referer': 'https://www.google.com/'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # Try to get meta description first
-        meta_desc = soup.find('meta', attrs={'name': 'description'})
-        if meta_desc and meta_desc.get('content'):
-            return meta_desc['content'][:500]
+        with http_session.get(url, timeout=FETCH_TIMEOUT, stream=True) as response:
+            response.raise_for_status()
+            decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+            parser = ArticleSummaryParser()
+            bytes_read = 0
+            # Stop reading as soon as the meta description or a usable paragraph shows up
+            for chunk in response.iter_content(chunk_size=16384):
+                parser.feed(decoder.decode(chunk))
+                bytes_read += len(chunk)
+                if parser.description or parser.paragraph or bytes_read >= ARTICLE_MAX_BYTES:
+                    break
         
-        # Fallback to first substantial paragraph
-        paragraphs = soup.find_all('p')
-        for p in paragraphs:
-            text = p.get_text().strip()
-            if len(text) > 50:
-                return text[:500]
+        # Prefer the meta description, fall back to first substantial paragraph
+        content = parser.description or parser.paragraph
+        if content:
+            cache_put(ARTICLE_CONTENT_CACHE, url, content[:500])
+            return content[:500]
         
         return None
         
@@ -515,6 +952,11 @@ def extract_article_content(url):
 
 def generate_content_aware_post(title, category, article_url, trend_term=None):
     """Generate relevant post based on actual article content using GPT."""
+    cache_key = (title, category, trend_term)
+    cached = cache_get(GENERATED_POST_CACHE, cache_key)
+    if cached is not None:
+        write_log(f"Reusing generated post for: {title[:60]}...")
+        return cached
     try:
         article_content = extract_article_content(article_url)
         content_context = f"Title: {title}\n"
@@ -552,19 +994,22 @@ Write ONLY the tweet text, no quotes or explanations:"""
         if trend_term and len(gpt_text) < 180:
             gpt_text = f"Trending {trend_term}: {gpt_text}"
         
-        tags = CATEGORY_HASHTAGS.get(category, [])
-        if tags:
+        tag_keywords = CATEGORY_TAG_KEYWORDS.get(category, [])
+        if tag_keywords:
             remaining_space = 240 - len(gpt_text)
             selected_tags = []
-            for tag in tags[:3]:
-                if tag.replace("#", "").lower() in gpt_text.lower() or tag.replace("#", "").lower() in title.lower():
+            hits = set(CATEGORY_TAG_PATTERNS[category].findall(f"{gpt_text} {title}".lower()))
+            for tag, keyword in tag_keywords:
+                if any(keyword in hit for hit in hits):
                     if len(" " + tag) <= remaining_space and len(selected_tags) < 2:
                         selected_tags.append(tag)
                         remaining_space -= len(" " + tag)
             if selected_tags:
                 gpt_text += " " + " ".join(selected_tags)
         
-        return validate_tweet_length(gpt_text)
+        post_text = validate_tweet_length(gpt_text)
+        cache_put(GENERATED_POST_CACHE, cache_key, post_text)
+        return post_text
     
     except Exception as e:
         write_log(f"GPT generation failed: {e}")
@@ -591,28 +1036,13 @@ def generate_fallback_post(title, category, trend_term=None):
     else:
         main_part = title[:80]
     
-    category_prefixes = {
-        "Arsenal": ["Arsenal news:", "Gunners update:", "Arsenal:"],
-        "Manchester United": ["Man Utd news:", "Red Devils update:", "MUFC:"],
-        "EPL": ["Premier League:", "EPL update:"],
-        "F1": ["F1 news:", "Formula 1:"],
-        "MotoGP": ["MotoGP news:", "Grand Prix update:"],
-        "Kenyan Politics": ["Kenya:", "Politics news:"],
-        "Kenyan Tourism": ["Kenya travel:", "Safari update:"],
-        "World Finance": ["Markets:", "Finance:"],
-        "Crypto": ["Crypto news:", "Blockchain update:"],
-        "Cycling": ["Cycling news:", "Pro cycling:"],
-        "Space Exploration": ["Space news:", "NASA update:"],
-        "Tesla": ["Tesla news:", "EV update:"]
-    }
-    
-    prefix = random.choice(category_prefixes.get(category, ["News:"]))
+    prefix = rng.choice(FALLBACK_PREFIXES.get(category, DEFAULT_FALLBACK_PREFIXES))
     tweet_text = f"{prefix} {main_part}"
     
     if trend_term:
         tweet_text = f"Trending {trend_term} - {tweet_text}"
     
-    tags = CATEGORY_HASHTAGS.get(category, [])
+    tags = CATEGORY_HASHTAGS.get(category, ())
     if tags and len(tweet_text) < 200:
         tweet_text += " " + tags[0]
     
@@ -622,144 +1052,146 @@ def generate_fallback_post(title, category, trend_term=None):
 # POST TO TWITTER
 # =========================
 
-def pick_relevant_image(category):
-    """Modified for Railway - images won't persist"""
-    write_log("Images not available in Railway environment")
-    return None
-    files = [f for f in os.listdir(IMAGE_FOLDER) if f.lower().endswith((".png", ".jpg", ".jpeg"))]
-    if not files:
-        write_log(f"No image files found in '{IMAGE_FOLDER}'")
-        return None
-    category_keywords = IMAGE_CATEGORIES.get(category, [])
-    relevant_files = []
-    for file in files:
-        file_lower = file.lower()
-        if any(keyword in file_lower for keyword in category_keywords):
-            relevant_files.append(file)
-    if not relevant_files:
-        write_log(f"No images match keywords for category '{category}': {category_keywords}")
-        chosen_files = files
-    else:
-        chosen_files = relevant_files
-    chosen_image = os.path.join(IMAGE_FOLDER, random.choice(chosen_files))
-    write_log(f"Selected image: {chosen_image}")
-    return chosen_image
-
-def post_tweet(text, category=None):
+def post_tweet(text):
     """Post tweet with improved rate limiting and error handling."""
-    global last_post_time
+    global last_post_time, rate_limit_reset_at
     if not can_post_now():
         write_log("Too soon to post. Waiting for rate limit window...")
         return False
-    retries = 3
+    wait_time = post_bucket.take()
+    if wait_time:
+        write_log(f"Daily post limit reached. Next post allowed in {wait_time/60:.0f} minutes")
+        return False
+    retries = len(POST_RETRY_DELAYS) + 1
     for attempt in range(retries):
         try:
             text = validate_tweet_length(text)
-            image_path = pick_relevant_image(category) if category else None
-            media_ids = []
-            if image_path and os.path.exists(image_path):
-                media = twitter_api.media_upload(image_path)
-                media_ids = [media.media_id]
-            twitter_client.create_tweet(text=text, media_ids=media_ids or None)
-            write_log(f"Tweet posted {'with image' if media_ids else 'without image'}")
+            twitter_client.create_tweet(text=text)
+            write_log("Tweet posted")
             last_post_time = datetime.now(pytz.UTC)
             return True
         except Exception as e:
             error_msg = str(e)
-            if "429" in error_msg:
-                wait_time = 15 * 60
-                write_log(f"Rate limit hit. Waiting {wait_time/60} minutes before retry...")
-                time.sleep(wait_time)
+            if isinstance(e, tweepy.TooManyRequests) or "429" in error_msg:
+                rate_limit_reset_at = get_rate_limit_reset(e)
+                write_log(f"Rate limit hit. Posting paused until {rate_limit_reset_at:%H:%M} UTC")
+                break
             elif "duplicate" in error_msg.lower():
                 write_log("Duplicate tweet detected. Skipping...")
-                return False
+                break
             else:
                 write_log(f"Error posting tweet (attempt {attempt + 1}): {e}")
                 if attempt == retries - 1:
-                    return False
-                time.sleep(30)
+                    break
+                time.sleep(POST_RETRY_DELAYS[attempt])
+    post_bucket.give_back()
     return False
 # =========================
 # TREND DETECTION
 # =========================
 
+def get_trends(woeid):
+    """Fetch trending topic names for a WOEID, reusing results younger than TRENDS_CACHE_TTL."""
+    cached = TRENDS_CACHE.get(woeid)
+    if cached and time.time() - cached[0] < TRENDS_CACHE_TTL:
+        return cached[1]
+    trends_result = twitter_api.get_place_trends(woeid)
+    trends = [t["name"] for t in trends_result[0]["trends"]]
+    TRENDS_CACHE[woeid] = (time.time(), trends)
+    return trends
+
 def detect_category_from_trends():
     """Fetch trending topics from Twitter and match to categories."""
     try:
-        category_woeids = {
-            "Kenyan Politics": 23424863,
-            "Kenyan Tourism": 23424863,
-            "Arsenal": 1,
-            "Manchester United": 1,
-            "EPL": 1,
-            "F1": 1,
-            "MotoGP": 1,
-            "World Finance": 1,
-            "Crypto": 1,
-            "Cycling": 1,
-            "Space Exploration": 1,
-            "Tesla": 1
-        }
-        category = random.choice(list(RSS_FEEDS.keys()))
-        woeid = category_woeids.get(category, 1)
-        trends_result = twitter_api.get_place_trends(woeid)
-        trends = [t["name"] for t in trends_result[0]["trends"]]
+        category = random.choice(CATEGORY_LIST)
+        woeid = CATEGORY_WOEIDS.get(category, 1)
+        trends = get_trends(woeid)
         write_log(f"Trending terms for WOEID {woeid}: {trends[:5]}")
         for trend in trends:
-            for cat, keywords in TREND_KEYWORDS.items():
-                if any(kw.lower() in trend.lower() for kw in keywords):
+            trend_lower = trend.lower()
+            for cat, pattern in TREND_PATTERNS:
+                if pattern.search(trend_lower):
                     write_log(f"Trend '{trend}' matched to category '{cat}'")
                     return cat, trend
         write_log(f"No trend match found. Using fallback category: {category}")
         return category, None
     except Exception as e:
         write_log(f"Twitter trends error: {e}")
-        return random.choice(list(RSS_FEEDS.keys())), None
+        return random.choice(CATEGORY_LIST), None
+
+def cached_detect_category():
+    """Return a recent trend-matched category, or detect a fresh one."""
+    global trend_category_cache
+    if trend_category_cache and time.time() - trend_category_cache[0] < TREND_CATEGORY_CACHE_TTL:
+        return trend_category_cache[1]
+    category, trend_term = detect_category_from_trends()
+    # Random fallback picks are not cached so untrended jobs keep rotating categories
+    if trend_term:
+        trend_category_cache = (time.time(), (category, trend_term))
+    return category, trend_term
 
 
 # =========================
 # NEWS + FALLBACK FLOW
 # =========================
 
-def get_articles_for_category(category):
-    """Get articles for a category with fallback handling."""
+def get_articles_for_category(category, executor=http_executor):
+    """Get articles for a category with fallback handling; extra feeds are fetched on `executor`."""
     feeds = RSS_FEEDS.get(category, [])
-    articles = []
-    for feed in feeds:
-        feed_articles = fetch_rss(feed)
-        articles.extend(feed_articles)
-        if articles:
-            break
+    feed_cache = {}
+    if feeds:
+        # The first feed normally has news; only fan out to the others, concurrently, when it is empty
+        feed_cache[feeds[0]] = fetch_rss(feeds[0])
+        if not feed_cache[feeds[0]]:
+            feed_cache.update(zip(feeds[1:], fetch_feeds(feeds[1:], executor)))
+    # Use the first feed (in listed order) that returned anything
+    articles = next((feed_articles for feed_articles in feed_cache.values() if feed_articles), [])
     if not articles and category in FALLBACK_KEYWORDS:
         write_log(f"No articles found for {category}, trying fallback keywords...")
-        for alt in FALLBACK_KEYWORDS[category]:
-            for feed in feeds:
-                articles.extend(fetch_rss(feed))
-            if articles:
-                break
+        # Retry the empty feeds once, then prefer entries mentioning a fallback keyword
+        empty_feeds = [feed for feed, feed_articles in feed_cache.items() if not feed_articles]
+        feed_cache.update(zip(empty_feeds, fetch_feeds(empty_feeds, executor)))
+        retried = [a for feed_articles in feed_cache.values() for a in feed_articles]
+        alts = FALLBACK_KEYWORDS_LC[category]
+        matching = [a for a in retried if any(alt in a["title_lower"] for alt in alts)]
+        articles = matching or retried
+    write_log(f"Total articles fetched for {category}: {len(articles)}")
     return articles
 
 def fallback_tweet(category):
     """Generate fallback tweet when no news is available."""
     if category in EVERGREEN_HOOKS:
-        tweet = random.choice(EVERGREEN_HOOKS[category])
-        tags = CATEGORY_HASHTAGS.get(category, [])
+        tweet = rng.choice(EVERGREEN_HOOKS[category])
+        tags = CATEGORY_HASHTAGS.get(category, ())
         if tags:
-            additional_tags = random.sample(tags, min(2, len(tags)))
+            additional_tags = rng.sample(tags, min(2, len(tags)))
             tweet += " " + " ".join(additional_tags)
         return validate_tweet_length(tweet)
     return validate_tweet_length(f"No fresh news today for {category}, but the passion never stops!")
 
 def post_dynamic_update(category, trend_term=None):
     """Post update for category with content-aware generation and URL validation."""
-    articles = get_articles_for_category(category)
-    fresh_articles = [a for a in articles if is_fresh(a)]
+    return post_from_articles(category, get_articles_for_category(category), trend_term)
+
+def post_from_articles(category, articles, trend_term=None):
+    """Post the first new, reachable article from an already fetched list, else evergreen content."""
+    now_ts = time.time()
+    fresh_articles = [a for a in articles if is_fresh(a, now_ts)]
     target_articles = fresh_articles if fresh_articles else articles
+    # Drop already posted and near-duplicate articles before any network work
+    target_articles = [
+        a for a in target_articles
+        if not has_been_posted(a["url"]) and not has_similar_content_posted(a)
+    ]
     valid_articles_processed = 0
+    # Probe the leading candidates' URLs concurrently; later ones are validated on demand
+    candidate_urls = [article["url"] for article in target_articles[:VALIDATION_BATCH_SIZE]]
+    prevalidated = dict(zip(candidate_urls, http_executor.map(validate_url, candidate_urls)))
     for article in target_articles:
-        if has_been_posted(article["url"]) or has_similar_content_posted(article["title"]):
-            continue
-        if not validate_url(article["url"]):
+        is_valid = prevalidated.get(article["url"])
+        if is_valid is None:
+            is_valid = validate_url(article["url"])
+        if not is_valid:
             write_log(f"Skipping article with broken URL: {article['title'][:60]}...")
             continue
         valid_articles_processed += 1
@@ -770,16 +1202,15 @@ def post_dynamic_update(category, trend_term=None):
             trend_term
         )
         tweet_text = f"{post_text}\n\n{article['url']}"
-        if post_tweet(tweet_text, category):
-            log_posted(article["url"])
-            log_content_hash(article["title"])
+        if post_tweet(tweet_text):
+            log_posted(article["url"], article["content_hash"], get_article_simhash(article))
             write_log(f"Posted content-aware article from {category}")
             return True
     if valid_articles_processed == 0:
         write_log(f"No valid URLs found for {category} articles")
     write_log(f"No new articles for {category}, posting evergreen content...")
     tweet = fallback_tweet(category)
-    return post_tweet(tweet, category)
+    return post_tweet(tweet)
 
 # =========================
 # MAIN LOGIC
@@ -789,14 +1220,19 @@ def run_dynamic_job():
     """Runs a dynamic posting job with trend integration."""
     try:
         write_log("Starting dynamic job...")
-        category, trend_term = detect_category_from_trends()
-        success = post_dynamic_update(category, trend_term)
+        category, trend_term = cached_detect_category()
+        # Prefetch the backups' articles on separate workers so a failed post falls through without
+        # waiting, while the primary's own feed fetches and URL checks keep http_executor to themselves
+        backup_categories = random.sample([cat for cat in CATEGORY_LIST if cat != category], BACKUP_CATEGORY_COUNT)
+        prefetched = {
+            cat: category_executor.submit(get_articles_for_category, cat, backup_feed_executor)
+            for cat in backup_categories
+        }
+        success = post_from_articles(category, get_articles_for_category(category), trend_term)
         if not success:
             write_log("Primary category failed, trying random category...")
-            backup_categories = [cat for cat in RSS_FEEDS.keys() if cat != category]
-            random.shuffle(backup_categories)
-            for backup_category in backup_categories[:2]:
-                if post_dynamic_update(backup_category):
+            for backup_category in backup_categories:
+                if post_from_articles(backup_category, prefetched[backup_category].result()):
                     break
         write_log("Dynamic job completed")
     except Exception as e:
@@ -805,16 +1241,33 @@ def run_dynamic_job():
 # =========================
 # SCHEDULER
 # =========================
+
+# Upper bound on a single scheduler sleep, so clock adjustments are picked up reasonably soon
+SCHEDULER_MAX_SLEEP_SECONDS = 600
+
+# Jobs run one at a time on a worker thread so the scheduler loop is never blocked by them
+job_executor = ThreadPoolExecutor(max_workers=1)
+job_future = None
+
 def keepalive():
     """Send a keepalive log message"""
     write_log("Bot keepalive - still running")
+
+def run_in_background(job):
+    """Hand a job to the worker thread, skipping it if the previous job is still running."""
+    global job_future
+    if job_future is not None and not job_future.done():
+        write_log(f"Previous job still running, skipping {job.__name__}")
+        return
+    job_future = job_executor.submit(job)
+
 def schedule_posts():
     """Schedule posts with better timing."""
     times = ["05:30", "09:30", "12:00", "15:00", "17:30", "20:00", "22:30"]
     for t in times:
-        schedule.every().day.at(t).do(run_dynamic_job)
+        schedule.every().day.at(t).do(run_in_background, run_dynamic_job)
         write_log(f"Dynamic job scheduled at {t}")
-    schedule.every(POST_INTERVAL_MINUTES).minutes.do(run_dynamic_job).tag('interval-check')
+    schedule.every(POST_INTERVAL_MINUTES).minutes.do(run_in_background, run_dynamic_job).tag('interval-check')
 
 def start_scheduler():
     """Start the scheduler with initial setup."""
@@ -823,7 +1276,11 @@ def start_scheduler():
     write_log(f"Rate limiting: {DAILY_POST_LIMIT} posts/day, {POST_INTERVAL_MINUTES}min intervals")
     while True:
         schedule.run_pending()
-        time.sleep(60)
+        # Sleep until the next job is due instead of polling every minute
+        idle_seconds = schedule.idle_seconds()
+        if idle_seconds is None:
+            idle_seconds = SCHEDULER_MAX_SLEEP_SECONDS
+        time.sleep(min(max(1, idle_seconds), SCHEDULER_MAX_SLEEP_SECONDS))
 
 # =========================
 # TESTING & MANUAL FUNCTIONS
@@ -832,7 +1289,7 @@ def start_scheduler():
 def test_single_post(category=None):
     """Test function for single post."""
     if category is None:
-        category, trend_term = detect_category_from_trends()
+        category, trend_term = cached_detect_category()
     else:
         trend_term = None
     write_log(f"Testing single post for category: {category}")